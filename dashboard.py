@@ -1,9 +1,21 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
+import plotly.graph_objects as go
+import pyarrow as pa
+import pyarrow.csv as pv
 import json
+import os
 from datetime import date
 
+# orjson is an optional, faster drop-in for json.loads on the 'Activities' column
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
 # Set the page configuration for a wider layout
 st.set_page_config(
     layout="wide", 
@@ -31,87 +43,347 @@ NIC_SECTION_MAPPING = {
     '00': 'Unspecified Section'
 }
 
+# Dimensions kept in the pre-aggregated registration counts ("cube") used by the KPIs and charts
+CUBE_DIMENSIONS = [
+    'RegistrationDate', 'State', 'District', 'Pincode',
+    'NIC3DigitId', 'NIC_Section_Code_Desc', 'ActivityDescription'
+]
+
+# Bump when the processed frame's columns or dtypes change so stale Parquet caches are ignored
+PROCESSED_CACHE_VERSION = 3
+
+# Maximum number of points sent to the browser for the trend line
+TREND_MAX_POINTS = 500
+
+# Single bar colour; bar length already encodes the count, so no continuous colour scale
+BAR_COLOR = '#5A4FCF'
+
 # --- 1. Data Loading and Preprocessing ---
 
-@st.cache_data
-def load_and_process_data(file_path):
+def parse_registration_dates(values):
+    """
+    Converts DD/MM/YYYY strings to datetime64 by rearranging the characters into ISO
+    YYYY-MM-DD in numpy. Falls back to pd.to_datetime (invalid dates become NaT) when
+    any value does not fit the fixed-width layout.
+    """
+    try:
+        strings = np.asarray(values, dtype=str)
+        chars = strings.view('U1').reshape(len(strings), -1)
+        if (
+            chars.shape[1] == 10
+            and (chars[:, [2, 5]] == '/').all()
+            and np.char.isdigit(chars[:, [0, 1, 3, 4, 6, 7, 8, 9]]).all()
+        ):
+            iso = np.ascontiguousarray(chars[:, [6, 7, 8, 9, 2, 3, 4, 5, 0, 1]])
+            iso[:, [4, 7]] = '-'
+            days = iso.view('U10').ravel().astype('datetime64[D]')
+            # Stay within the datetime64[ns] range, otherwise let pandas coerce to NaT
+            if days.min() >= np.datetime64('1678-01-01') and days.max() <= np.datetime64('2262-04-11'):
+                return days.astype('datetime64[ns]')
+    except ValueError:
+        pass
+    return pd.to_datetime(values, format='%d/%m/%Y', errors='coerce', cache=True)
+
+def process_csv(file_path):
     """
     Loads data from CSV, cleans columns, and parses the JSON in the 'Activities' column.
     Adds NIC 3-Digit Code for filtering and an Industry_Suggestion for search.
     """
-    try:
-        # NOTE: Using a relative file path assumption
-        df = pd.read_csv(file_path) 
-
-        # 1. Convert 'RegistrationDate' to datetime objects
-        df['RegistrationDate'] = pd.to_datetime(df['RegistrationDate'], format='%d/%m/%Y', errors='coerce')
-
-        # 2. Clean 'Pincode' to remove decimals and treat as string/integer
-        df['Pincode'] = pd.to_numeric(df['Pincode'], errors='coerce').fillna(0).astype(int).astype(str)
-
-        # 3. Parse 'Activities' JSON to extract Description and NIC Code
-        def parse_activities(activities_str):
+    # NOTE: Using a relative file path assumption
+    # PyArrow's multithreaded reader; raw text columns are kept as strings for the steps below
+    table = pv.read_csv(
+        file_path,
+        convert_options=pv.ConvertOptions(
+            column_types={
+                'Pincode': pa.string(),
+                'RegistrationDate': pa.string(),
+                'Activities': pa.string(),
+            },
+            strings_can_be_null=True,
+        ),
+    )
+    df = table.to_pandas()
+
+    # 1. Convert 'RegistrationDate' to datetime objects
+    df['RegistrationDate'] = parse_registration_dates(df['RegistrationDate'])
+
+    # 2. Clean 'Pincode' to remove decimals and keep it as a compact int32 (formatted only for display)
+    # Values outside the 6-digit pincode range are mapped to 0 so the int32 cast cannot wrap
+    pincodes = pd.to_numeric(df['Pincode'], errors='coerce')
+    df['Pincode'] = pincodes.where(pincodes.between(0, 999999), 0).astype(np.int32)
+
+    # 3. Parse 'Activities' JSON to extract Description and NIC Code
+    def parse_activities(activities_str):
+        try:
             try:
+                # Fast path: the CSV reader has usually already unescaped the quotes
+                data = json_loads(activities_str)
+            except json.JSONDecodeError:
                 # Cleaning the escaped quotes typical in CSV JSON fields (e.g., '""' to '"')
                 cleaned_str = activities_str.replace('""', '"').replace('"[', '[').replace(']"', ']')
-                data = json.loads(cleaned_str)
-                # Extract primary activity details (first entry)
-                description = data[0].get('Description', 'Unspecified Activity')
-                nic_code = str(data[0].get('NIC5DigitId', '00000'))
-                return description, nic_code
-            except (json.JSONDecodeError, TypeError, IndexError):
-                return 'Unspecified Activity', '00000'
-
-        # Apply the parsing function and create new columns
-        df[['ActivityDescription', 'NIC5DigitId']] = df['Activities'].apply(
-            lambda x: pd.Series(parse_activities(str(x))) 
-        )
-        
-        # 4. Create the high-level NIC Section (first two digits)
-        df['NIC_Section'] = df['NIC5DigitId'].str[:2].replace('', '00')
-        
-        # NEW: Create descriptive NIC section column for visualization
-        df['NIC_Section_Desc'] = df['NIC_Section'].map(NIC_SECTION_MAPPING).fillna('Other/Unmapped Section')
-        
-        # Creating a better description for bar graph
-        df['NIC_Section_Code_Desc'] = df['NIC_Section'] + ' - ' + df['NIC_Section_Desc']
+                data = json_loads(cleaned_str)
+            # Extract primary activity details (first entry)
+            description = data[0].get('Description', 'Unspecified Activity')
+            nic_code = str(data[0].get('NIC5DigitId', '00000'))
+            return description, nic_code
+        except (json.JSONDecodeError, TypeError, IndexError):
+            return 'Unspecified Activity', '00000'
+
+    # Parse in a single pass and assign both columns at once (avoids a pd.Series per row)
+    parsed_activities = [parse_activities(str(s)) for s in df['Activities'].tolist()]
+    df['ActivityDescription'] = [desc for desc, _ in parsed_activities]
+    df['NIC5DigitId'] = [code for _, code in parsed_activities]
+    
+    # 4. Create the high-level NIC Section (first two digits)
+    # Plain list slicing is much cheaper than the object-dtype .str accessor
+    nic_codes = df['NIC5DigitId'].tolist()
+    df['NIC_Section'] = [c[:2] if c else '00' for c in nic_codes]
+    
+    # NEW: Create descriptive NIC section column for visualization
+    df['NIC_Section_Desc'] = df['NIC_Section'].map(NIC_SECTION_MAPPING).fillna('Other/Unmapped Section')
+    
+    # Creating a better description for bar graph
+    df['NIC_Section_Code_Desc'] = df['NIC_Section'] + ' - ' + df['NIC_Section_Desc']
 
-        # NEW: Create NIC 3-Digit Code for filtering
-        df['NIC3DigitId'] = df['NIC5DigitId'].str[:3].replace('', '000')
+    # NEW: Create NIC 3-Digit Code for filtering
+    df['NIC3DigitId'] = [c[:3] if c else '000' for c in nic_codes]
 
-        # 5. Clean up string fields: CommunicationAddress and EnterpriseName
-        df['CommunicationAddress'] = df['CommunicationAddress'].fillna('').astype(str)
-        df['EnterpriseName'] = df['EnterpriseName'].fillna('').astype(str) 
-        
-        # Drop rows where RegistrationDate could not be parsed
-        df.dropna(subset=['RegistrationDate'], inplace=True)
-        
-        # --- PREPARE SUGGESTIONS FOR MULTI-SELECT FIELDS ---
-        # Combined Industry Suggestions (Now based on NIC 3-Digit)
-        df['Industry_Suggestion'] = df['NIC3DigitId'] + ' - ' + df['ActivityDescription']
-        industry_suggestions = sorted(df['Industry_Suggestion'].unique().tolist())
-        
-        # Enterprise Name Suggestions
-        name_suggestions = sorted(df['EnterpriseName'].unique().tolist())
-        
-        # Pincode Suggestions
-        pincode_options = sorted(df['Pincode'].unique().tolist())
-        
-        # Communication Address Suggestions
-        address_options = sorted(df['CommunicationAddress'].unique().tolist())
-        
-        return df, industry_suggestions, name_suggestions, pincode_options, address_options
+    # 5. Clean up string fields: CommunicationAddress and EnterpriseName
+    df['CommunicationAddress'] = df['CommunicationAddress'].fillna('').astype(str)
+    df['EnterpriseName'] = df['EnterpriseName'].fillna('').astype(str) 
+    
+    # Drop rows where RegistrationDate could not be parsed
+    df.dropna(subset=['RegistrationDate'], inplace=True)
+    
+    # Combined Industry Suggestion (Now based on NIC 3-Digit), built from the plain strings
+    df['Industry_Suggestion'] = df['NIC3DigitId'] + ' - ' + df['ActivityDescription']
+
+    # 6. Store repeated strings as categoricals so filters and counts work on integer codes
+    for col in ['State', 'District', 'EnterpriseName', 'NIC3DigitId',
+                'NIC_Section', 'NIC_Section_Code_Desc', 'ActivityDescription']:
+        df[col] = df[col].astype('category')
+
+    return df
+
+@st.cache_resource
+def load_and_process_data(file_path):
+    """
+    Returns the processed DataFrame, shared read-only across reruns and sessions
+    (cache_resource stores the reference, so Streamlit never hashes or copies the frame).
+    The processed frame is persisted as Parquet next to the CSV and reused while it is
+    newer than the CSV, so cold starts skip the CSV and JSON parsing.
+    """
+    try:
+        cache_path = f"{file_path}.v{PROCESSED_CACHE_VERSION}.parquet"
+        if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(file_path):
+            try:
+                return pd.read_parquet(cache_path)
+            except (OSError, pa.ArrowException):
+                # Unreadable or truncated cache; rebuild it from the CSV below
+                pass
+
+        df = process_csv(file_path)
+        # Write to a temp file in the same directory and swap it in atomically, so a killed
+        # process or a concurrent writer never leaves a partial cache at cache_path
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            df.to_parquet(tmp_path, compression='zstd')
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            # The Parquet copy is only a cache; carry on if the directory is read-only
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        return df
     
     except FileNotFoundError:
         st.error(f"Error: The file '{file_path}' was not found. Please ensure the file is present in the same directory.")
-        return pd.DataFrame(), [], [], [], []
+        return pd.DataFrame()
+
+@st.cache_data
+def suggestion_lists(_df):
+    """
+    Builds the sorted option lists for the multi-select fields from the loaded frame.
+    """
+    # Categories are already unique and sorted; the other string columns are de-duplicated
+    # with pd.unique and sorted with sorted(), which is faster than np.sort on object arrays
+    industry_suggestions = sorted(pd.unique(_df['Industry_Suggestion']).tolist())
+    
+    # Enterprise Name Suggestions
+    name_suggestions = _df['EnterpriseName'].cat.categories.tolist()
+    
+    # Pincode Suggestions
+    pincode_options = np.unique(_df['Pincode'].to_numpy()).tolist()
+    
+    # Communication Address Suggestions
+    address_options = sorted(pd.unique(_df['CommunicationAddress']).tolist())
+    
+    return industry_suggestions, name_suggestions, pincode_options, address_options
+
+def count_by_dimensions(frame):
+    """
+    Collapses enterprise rows into one 'Count' row per unique combination of CUBE_DIMENSIONS.
+    """
+    return frame.groupby(CUBE_DIMENSIONS, observed=True, dropna=False).size().reset_index(name='Count')
+
+@st.cache_resource
+def build_cube(_df):
+    """
+    Pre-aggregates registration counts once so that each rerun filters and sums unique
+    groups instead of enterprise rows. The cube only shrinks when rows repeat a group;
+    on sparse data (day x pincode x activity) it can be nearly as long as the frame.
+    Cached as a shared read-only resource, and the leading underscore tells Streamlit
+    not to hash the full DataFrame.
+    """
+    return count_by_dimensions(_df)
+
+def lttb_indices(values, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling: returns the positions of at most
+    n_out points that preserve the visual shape of an evenly spaced series.
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    bucket_size = (n - 2) / (n_out - 2)
+    selected = [0]
+    prev = 0
+    for i in range(n_out - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+
+        # Average of the next bucket acts as the third triangle vertex
+        avg_x = (end + next_end - 1) / 2
+        avg_y = values[end:next_end].mean()
+
+        xs = np.arange(start, end)
+        areas = np.abs((prev - avg_x) * (values[xs] - values[prev]) - (prev - xs) * (avg_y - values[prev]))
+        prev = start + int(areas.argmax())
+        selected.append(prev)
+
+    selected.append(n - 1)
+    return np.array(selected)
+
+def column_equals(column, value):
+    """
+    Numpy boolean array of column == value, compared on the integer codes for categoricals.
+    """
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        categories = column.cat.categories
+        if value not in categories:
+            return np.zeros(len(column), dtype=bool)
+        return column.cat.codes.to_numpy() == categories.get_loc(value)
+    return column.to_numpy() == value
+
+def column_isin(column, values):
+    """
+    Numpy boolean array of column.isin(values); for categoricals the selected values are
+    translated to integer codes once and matched with np.isin on the codes array.
+    """
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        selected_codes = column.cat.categories.get_indexer(list(values))
+        return np.isin(column.cat.codes.to_numpy(), selected_codes[selected_codes >= 0])
+    return np.isin(column.to_numpy(), list(values))
+
+def top_counts(column, counts, k=None):
+    """
+    Sums counts per category of a categorical column with np.bincount on its codes and
+    returns the k largest non-zero totals (all of them when k is None), largest first.
+    """
+    codes = column.cat.codes.to_numpy()
+    valid = codes >= 0
+    totals = np.bincount(
+        codes[valid],
+        weights=np.asarray(counts)[valid],
+        minlength=len(column.cat.categories),
+    ).astype(np.int64)
+
+    top = np.flatnonzero(totals)
+    if k is not None and len(top) > k:
+        # O(n) selection of the k-th largest total; only candidates at or above it get sorted
+        kth_total = np.partition(totals[top], len(top) - k)[len(top) - k]
+        top = top[totals[top] >= kth_total]
+    # Stable sort so ties keep category order
+    top = top[np.argsort(-totals[top], kind='stable')][:k]
+    return pd.Series(totals[top], index=column.cat.categories.take(top), name='Count').rename_axis(column.name)
+
+def selection_mask(frame, date_range, state, district, pincodes, nic3_codes):
+    """
+    Builds a single numpy boolean mask for the shared filter selections. Works on both the
+    enterprise rows and the aggregated cube since they use the same column names.
+    """
+    dates = frame['RegistrationDate'].to_numpy()
+    mask = (dates >= np.datetime64(date_range[0])) & (dates <= np.datetime64(date_range[1]))
+    if state != 'All States':
+        mask &= column_equals(frame['State'], state)
+    if district != 'All Districts':
+        mask &= column_equals(frame['District'], district)
+    if pincodes:
+        mask &= column_isin(frame['Pincode'], pincodes)
+    if nic3_codes:
+        mask &= column_isin(frame['NIC3DigitId'], nic3_codes)
+    return mask
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def filter_positions(_df, date_range, state, district, pincodes, industries, names):
+    """
+    Row positions of the enterprise rows, and of the cube groups (None when names are
+    selected), that match the selections. Only these integer arrays are cached, so a
+    cache hit never unpickles a copy of the filtered frame.
+    """
+    # Extract the 3-digit NIC codes from the selected "NIC - Activity" strings
+    nic3_codes = {item.split(' - ')[0].strip() for item in industries}
+
+    mask = selection_mask(_df, date_range, state, district, pincodes, nic3_codes)
+    if names:
+        mask &= column_isin(_df['EnterpriseName'], names)
+        return np.flatnonzero(mask), None
+
+    cube = build_cube(_df)
+    cube_mask = selection_mask(cube, date_range, state, district, pincodes, nic3_codes)
+    return np.flatnonzero(mask), np.flatnonzero(cube_mask)
+
+def apply_filters(df, date_range, state, district, pincodes, industries, names):
+    """
+    Returns the filtered enterprise rows and the matching slice of the aggregated cube.
+    Selections are passed as tuples so repeat queries reuse the cached row positions.
+    """
+    row_positions, cube_positions = filter_positions(
+        df, date_range, state, district, pincodes, industries, names
+    )
+    filtered_df = df.iloc[row_positions]
+
+    if cube_positions is None:
+        # Enterprise names are not a cube dimension, so aggregate the (already narrow) filtered rows
+        filtered_cube = count_by_dimensions(filtered_df)
+    else:
+        filtered_cube = build_cube(df).iloc[cube_positions]
+
+    return filtered_df, filtered_cube
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def geo_name_options(_df, date_range, state, district):
+    """
+    Sorted enterprise names for the current date range and geography, cached so that
+    editing the search filters does not rebuild the list.
+    """
+    mask = selection_mask(_df, date_range, state, district, (), ())
+    names = _df['EnterpriseName']
+    # Categories are already sorted, so the used codes (unique ints) map straight to sorted names
+    used_codes = np.unique(names.cat.codes.to_numpy()[mask])
+    return names.cat.categories.take(used_codes[used_codes >= 0]).tolist()
 
 # Load the dataframe and suggestions
-df, industry_suggestions, name_suggestions, pincode_options, address_options = load_and_process_data(file_name)
+df = load_and_process_data(file_name)
 
 if df.empty:
     st.stop()
 
+industry_suggestions, name_suggestions, pincode_options, address_options = suggestion_lists(df)
+
 # --- 2. Top-of-Page Filters (Multi-Select Updates) ---
 
 st.title("📊 UDYAM Registrations Dashboard")
@@ -120,7 +392,6 @@ st.markdown("Use the filters to refine the data for **{:,}** total records.".for
 with st.expander("Filter Controls (Click to expand)", expanded=True):
     
     col_time, col_geo, col_search = st.columns(3) 
-    district_filter_applied = False
     
     # --- Col A: TIME ---
     with col_time:
@@ -135,20 +406,14 @@ with st.expander("Filter Controls (Click to expand)", expanded=True):
             value=(min_date, max_date),
             format="YYYY-MM-DD",
         )
-        start_date = pd.to_datetime(date_range[0])
-        end_date = pd.to_datetime(date_range[1])
-        
-        date_filtered_df = df[
-            (df['RegistrationDate'] >= start_date) & 
-            (df['RegistrationDate'] <= end_date)
-        ]
+        date_mask = selection_mask(df, date_range, 'All States', 'All Districts', (), ())
 
     # --- Col B: GEOGRAPHY (State & District) ---
     with col_geo:
         st.subheader("Geography")
         
         # 2. State (UPDATED to Selectbox for single selection and search)
-        all_states = sorted(date_filtered_df['State'].unique().tolist())
+        all_states = sorted(df['State'][date_mask].unique().tolist())
         state_options = ['All States'] + all_states
         
         selected_state = st.selectbox(
@@ -158,15 +423,14 @@ with st.expander("Filter Controls (Click to expand)", expanded=True):
             help="Select or type to filter by State."
         )
         
-        # Intermediate filtering based on State selection
-        if selected_state == 'All States':
-            state_filtered_df = date_filtered_df
-        else:
-            state_filtered_df = date_filtered_df[date_filtered_df['State'] == selected_state]
+        # Intermediate mask based on State selection (rows are only sliced once, in apply_filters)
+        state_mask = date_mask
+        if selected_state != 'All States':
+            state_mask = date_mask & column_equals(df['State'], selected_state)
 
         # 3. District (UPDATED to Selectbox for single selection and search)
         # Options are now dependent on the selected state
-        all_districts = sorted(state_filtered_df['District'].unique().tolist())
+        all_districts = sorted(df['District'][state_mask].unique().tolist())
         district_options = ['All Districts'] + all_districts
         
         selected_district = st.selectbox(
@@ -176,12 +440,7 @@ with st.expander("Filter Controls (Click to expand)", expanded=True):
             help="Select or type to filter by District (filtered by State selection)."
         )
 
-        # Final filtering for Geography
-        if selected_district == 'All Districts':
-            district_filtered_df = state_filtered_df
-        else:
-            district_filter_applied = True
-            district_filtered_df = state_filtered_df[state_filtered_df['District'] == selected_district]
+        district_filter_applied = selected_district != 'All Districts'
 
     # --- Col C: SEARCH (Pincode, NIC/Activity, Name, Address) ---
     with col_search:
@@ -196,7 +455,7 @@ with st.expander("Filter Controls (Click to expand)", expanded=True):
         )
 
         # 5. Enterprise Name (Multi-Select, options are dynamic)
-        name_options = sorted(district_filtered_df['EnterpriseName'].unique().tolist())
+        name_options = geo_name_options(df, date_range, selected_state, selected_district)
         selected_enterprise_name = st.multiselect(
             "6. Filter by Enterprise Name", 
             options=name_options,
@@ -209,28 +468,21 @@ with st.expander("Filter Controls (Click to expand)", expanded=True):
             "4. Filter by Pincode", 
             options=pincode_options,
             default=[],
+            format_func=str,
             help="Select one or more Pincodes."
         )
 
-# --- 3. Final Filtering Logic (Sequential Application) ---
-
-# Use the result of the geography filtering as the base
-filtered_df = district_filtered_df.copy()
-
-# 1. Pincode filter (Now uses .isin() for multi-select)
-if selected_pincode:
-    filtered_df = filtered_df[filtered_df['Pincode'].isin(selected_pincode)]
-
-# 2. Combined NIC/Activity Filter (using NIC 3-Digit)
-if selected_industry:
-    # Extract the 3-digit NIC codes from the selected strings
-    selected_nic3_codes = [item.split(' - ')[0].strip() for item in selected_industry]
-    filtered_df = filtered_df[filtered_df['NIC3DigitId'].isin(selected_nic3_codes)]
-
+# --- 3. Final Filtering Logic (Cached per Selection) ---
 
-# 3. Enterprise Name filter (Now uses .isin() for multi-select)
-if selected_enterprise_name:
-    filtered_df = filtered_df[filtered_df['EnterpriseName'].isin(selected_enterprise_name)]
+filtered_df, filtered_cube = apply_filters(
+    df,
+    date_range,
+    selected_state,
+    selected_district,
+    tuple(selected_pincode),
+    tuple(selected_industry),
+    tuple(selected_enterprise_name),
+)
 
 # --- 4. Main Dashboard Layout and Visualizations ---
 
@@ -239,10 +491,6 @@ st.markdown("---")
 if filtered_df.empty:
     st.warning("No data matches your current filter selections. Please adjust the filters above.")
 else:
-    # IMPORTANT FIX: Create a fresh copy to prevent potential Streamlit/Pandas 
-    # internal errors related to 'PandasThen' objects
-    filtered_df = filtered_df.copy() 
-    
     # --- KPIs ---
     st.header("Key Performance Indicators (KPIs) - Filtered Results")
     
@@ -256,13 +504,15 @@ else:
     # KPI 2: Top Industry Description (Dynamic based on filter) - WIDER
     with col2:
         # Calculate the most frequent activity description
-        top_activity_desc = filtered_df['ActivityDescription'].mode().iloc[0] if not filtered_df['ActivityDescription'].empty else "No Activity"
+        # Single bincount over the category codes; ties resolve to the first category, like mode()
+        top_activity = top_counts(filtered_cube['ActivityDescription'], filtered_cube['Count'], 1)
+        top_activity_desc = top_activity.index[0] if not top_activity.empty else "No Activity"
         st.metric(label="Top Industry Description", value=top_activity_desc)
 
     # KPI 3: Average Daily Registrations (Dynamic based on filter)
     with col3:
         # Group by day and calculate the mean count
-        daily_reg = filtered_df.groupby(pd.Grouper(key='RegistrationDate', freq='D')).size().reset_index(name='Count')
+        daily_reg = filtered_cube.groupby(pd.Grouper(key='RegistrationDate', freq='D'))['Count'].sum().reset_index(name='Count')
         avg_daily = daily_reg['Count'].mean() if not daily_reg.empty else 0
         st.metric(label="Average Daily Registrations", value=f"{avg_daily:.2f}")
 
@@ -274,15 +524,32 @@ else:
 
     with trend_col:
         st.subheader("Monthly Registration Trend")
-        monthly_reg = filtered_df.groupby(pd.Grouper(key='RegistrationDate', freq='M')).size().reset_index(name='Registrations')
-        monthly_reg['Month'] = monthly_reg['RegistrationDate'].dt.to_period('M').astype(str)
-
-        fig_trend = px.line(
-            monthly_reg, 
-            x='Month', 
-            y='Registrations', 
+        # Bucket by month offset with np.bincount (keeps empty months in the range at zero)
+        months = filtered_cube['RegistrationDate'].to_numpy().astype('datetime64[M]')
+        first_month = months.min()
+        month_totals = np.bincount(
+            (months - first_month).astype(np.int64),
+            weights=filtered_cube['Count'].to_numpy(),
+        ).astype(np.int64)
+        monthly_reg = pd.DataFrame({
+            'Month': (first_month + np.arange(len(month_totals))).astype(str),
+            'Registrations': month_totals,
+        })
+        # Bound the trace size for long date ranges while keeping the shape of the line
+        monthly_reg = monthly_reg.iloc[lttb_indices(monthly_reg['Registrations'], TREND_MAX_POINTS)]
+
+        # WebGL line (Scattergl) so the browser draws the trend on the GPU instead of as SVG
+        fig_trend = go.Figure(
+            go.Scattergl(
+                x=monthly_reg['Month'],
+                y=monthly_reg['Registrations'],
+                mode='lines+markers'
+            )
+        )
+        fig_trend.update_layout(
             title='Monthly Enterprise Registrations',
-            markers=True
+            xaxis_title='Month',
+            yaxis_title='Registrations'
         )
         st.plotly_chart(fig_trend, use_container_width=True)
 
@@ -295,17 +562,16 @@ else:
         st.subheader("Top 10 NIC Sections (2-Digit Description)")
         
         # MODIFIED: Use the new descriptive column for visualization
-        nic_count = filtered_df['NIC_Section_Code_Desc'].value_counts().head(10).reset_index(name='Count')
+        nic_count = top_counts(filtered_cube['NIC_Section_Code_Desc'], filtered_cube['Count'], 10).reset_index()
         nic_count.rename(columns={'NIC_Section_Code_Desc': 'NIC Section'}, inplace=True)
-        nic_count = nic_count.copy() 
 
         # Plot as a vertical bar chart, similar to the district chart
         fig_nic = px.bar(
             nic_count,
             x='NIC Section', # Use the descriptive name on the X-axis
             y='Count',       # Y-axis for count
-            color='Count',
-            color_continuous_scale=px.colors.sequential.Agsunset, 
+            color_discrete_sequence=[BAR_COLOR],
+            template='simple_white',
             title='Top 10 Distribution by NIC Section'
         )
 
@@ -318,7 +584,7 @@ else:
     with activity_col:
         st.subheader("Top Specific Business Activities (Top 15)")
         
-        top_activities_count = filtered_df['ActivityDescription'].value_counts().head(15).reset_index()
+        top_activities_count = top_counts(filtered_cube['ActivityDescription'], filtered_cube['Count'], 15).reset_index()
         top_activities_count.columns = ['Activity Description', 'Count']
         
         # Horizontal bar chart for better readability of long labels
@@ -328,8 +594,8 @@ else:
             x='Count',
             y='Activity Description',
             orientation='h',
-            color='Count',
-            color_continuous_scale=px.colors.sequential.Plotly3,
+            color_discrete_sequence=[BAR_COLOR],
+            template='simple_white',
             title='Ranking of Top 15 Enterprise Activities'
         )
 
@@ -342,14 +608,15 @@ else:
     with geo_col:
         if not district_filter_applied:
             st.subheader("Registrations by District")
-            reg_by_district = filtered_df['District'].value_counts().reset_index(name='Count')
+            reg_by_district = top_counts(filtered_cube['District'], filtered_cube['Count']).reset_index()
             
             # Bar chart retained
             fig_district = px.bar(
                 reg_by_district,
                 x='District',
                 y='Count',
-                color='Count',
+                color_discrete_sequence=[BAR_COLOR],
+                template='simple_white',
                 title='Total Registrations per District'
             )
 
@@ -371,4 +638,9 @@ else:
         'ActivityDescription',
         'CommunicationAddress',
     ]
-    st.dataframe(filtered_df[display_cols], height=300, use_container_width=True)
+    st.dataframe(
+        filtered_df[display_cols],
+        height=300,
+        use_container_width=True,
+        column_config={'Pincode': st.column_config.NumberColumn(format='%d')}
+    )